@@ -3,6 +3,7 @@
 from .session_analyzer import (
     SessionAnalyzer,
     build_global_synthesis_prompt,
+    build_session_analysis_instructions,
     build_session_analysis_prompt,
     load_global_synthesis_template,
     load_session_analysis_template,
@@ -13,10 +14,14 @@ from .session_analyzer import (
 
 def __getattr__(name: str):
     """Lazy import for optional dependencies."""
-    if name == "AnalyzerClaudeClient":
+    if name in (
+        "AnalyzerClaudeClient",
+        "AnalyzerClaudeClientPool",
+        "ClaudeQueryError",
+    ):
         from . import claude_client
 
-        return claude_client.AnalyzerClaudeClient
+        return getattr(claude_client, name)
     raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
@@ -24,9 +29,12 @@ __all__ = [
     # Session analysis
     "SessionAnalyzer",
     "build_session_analysis_prompt",
+    "build_session_analysis_instructions",
     "load_session_analysis_template",
     "build_global_synthesis_prompt",
     "load_global_synthesis_template",
     # Claude client (lazy loaded)
     "AnalyzerClaudeClient",
+    "AnalyzerClaudeClientPool",
+    "ClaudeQueryError",
 ]
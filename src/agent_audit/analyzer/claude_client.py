@@ -3,17 +3,36 @@
 Provides async context manager interface with lazy API key validation.
 """
 
+import asyncio
+import contextlib
 import json
 import os
-from typing import Optional
+from typing import AsyncGenerator, Optional
 
 from claude_agent_sdk import (
     AssistantMessage,
     ClaudeAgentOptions,
     ClaudeSDKClient,
+    ResultMessage,
     TextBlock,
 )
 
+# AssistantMessage.error values worth retrying after a backoff
+_RETRYABLE_MESSAGE_ERRORS = frozenset({"rate_limit", "server_error"})
+
+
+class ClaudeQueryError(RuntimeError):
+    """A query ended with an error result from Claude.
+
+    Attributes:
+        retryable: True for rate limits and server errors, where the same
+            query may succeed after a backoff
+    """
+
+    def __init__(self, message: str, retryable: bool = False):
+        super().__init__(message)
+        self.retryable = retryable
+
 
 class AnalyzerClaudeClient:
     """Wrapper for ClaudeSDKClient for pattern classification.
@@ -26,6 +45,8 @@ class AnalyzerClaudeClient:
         self.options = options
         self.client: Optional[ClaudeSDKClient] = None
         self._connected = False
+        # One SDK client is one conversation; queries must not interleave
+        self._query_lock = asyncio.Lock()
 
     async def __aenter__(self) -> "AnalyzerClaudeClient":
         """Async context manager entry - validates API key and connects."""
@@ -74,27 +95,57 @@ class AnalyzerClaudeClient:
 
         Raises:
             ValueError: If not connected
-            RuntimeError: If query fails
+            ClaudeQueryError: If Claude reports an error result
         """
-        if not self._connected or not self.client:
-            raise ValueError("Client not connected. Use async context manager.")
+        return "".join([chunk async for chunk in self.stream(prompt)])
 
-        await self.client.query(prompt)
-        return await self._collect_response()
+    async def stream(self, prompt: str) -> AsyncGenerator[str, None]:
+        """Send a query to Claude and yield response text as it arrives.
 
-    async def _collect_response(self) -> str:
-        """Collect full response from Claude."""
-        assert self.client is not None, "Client not connected"
+        If the caller stops early, closing the generator (for example with
+        contextlib.aclosing) reads and discards the rest of the response,
+        so the next query on this session starts clean.
 
-        full_response = ""
+        Args:
+            prompt: The prompt to send to Claude
 
-        async for message in self.client.receive_response():
-            if isinstance(message, AssistantMessage):
-                for block in message.content:
-                    if isinstance(block, TextBlock):
-                        full_response += block.text
+        Yields:
+            Text blocks of the response, in order
 
-        return full_response
+        Raises:
+            ValueError: If not connected
+            ClaudeQueryError: If Claude reports an error result
+        """
+        if not self._connected or not self.client:
+            raise ValueError("Client not connected. Use async context manager.")
+
+        async with self._query_lock:
+            await self.client.query(prompt)
+            message_error = None
+            result = None
+            responses = self.client.receive_response()
+            try:
+                async for message in responses:
+                    if isinstance(message, AssistantMessage):
+                        message_error = message.error or message_error
+                        for block in message.content:
+                            if isinstance(block, TextBlock):
+                                yield block.text
+                    elif isinstance(message, ResultMessage):
+                        result = message
+            finally:
+                # Drain whatever the caller did not read; a no-op once the
+                # response is complete
+                async for _ in responses:
+                    pass
+
+        if result is not None and result.is_error:
+            status = result.api_error_status
+            retryable = message_error in _RETRYABLE_MESSAGE_ERRORS or (
+                status is not None and (status == 429 or status >= 500)
+            )
+            detail = status or message_error or result.subtype
+            raise ClaudeQueryError(f"Claude query failed ({detail})", retryable)
 
     @staticmethod
     def extract_json(response: str) -> str:
@@ -145,3 +196,75 @@ class AnalyzerClaudeClient:
                 f"Failed to parse JSON response from Claude: {e}\n"
                 f"Response:\n{response[:500]}..."
             )
+
+
+class AnalyzerClaudeClientPool:
+    """Pool of AnalyzerClaudeClient sessions for concurrent queries.
+
+    Each AnalyzerClaudeClient answers one query at a time, so running
+    analyses in parallel needs one client per in-flight query. The pool
+    connects ``size`` clients and hands each query an idle one. It exposes
+    the same ``query`` interface as a single client.
+    """
+
+    def __init__(self, size: int, options: Optional[ClaudeAgentOptions] = None):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.clients = [AnalyzerClaudeClient(options) for _ in range(size)]
+        self._idle: asyncio.Queue[AnalyzerClaudeClient] = asyncio.Queue()
+
+    async def __aenter__(self) -> "AnalyzerClaudeClientPool":
+        """Connect all clients in the pool."""
+        results = await asyncio.gather(
+            *(client._connect() for client in self.clients), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                await self._disconnect()
+                raise result
+        for client in self.clients:
+            self._idle.put_nowait(client)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Disconnect all clients in the pool."""
+        await self._disconnect()
+
+    async def _disconnect(self) -> None:
+        """Disconnect every client, connected or not."""
+        await asyncio.gather(*(client._disconnect() for client in self.clients))
+
+    async def query(self, prompt: str) -> str:
+        """Send a query using the next idle client.
+
+        Args:
+            prompt: The prompt to send to Claude
+
+        Returns:
+            The full text response from Claude
+        """
+        client = await self._idle.get()
+        try:
+            return await client.query(prompt)
+        finally:
+            self._idle.put_nowait(client)
+
+    async def stream(self, prompt: str) -> AsyncGenerator[str, None]:
+        """Stream a query's response using the next idle client.
+
+        The client returns to the pool only after its response has been
+        fully read, even if the caller stops early.
+
+        Args:
+            prompt: The prompt to send to Claude
+
+        Yields:
+            Text blocks of the response, in order
+        """
+        client = await self._idle.get()
+        try:
+            async with contextlib.aclosing(client.stream(prompt)) as chunks:
+                async for chunk in chunks:
+                    yield chunk
+        finally:
+            self._idle.put_nowait(client)
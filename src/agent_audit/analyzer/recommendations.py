@@ -1,5 +1,9 @@
 """Recommendation generation from global synthesis."""
 
+import copy
+import functools
+import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
@@ -7,6 +11,10 @@ from typing import Optional
 
 import tomllib
 
+# Tokens that matter when looking for the end of a fenced TOML block: a
+# triple quote toggles multi-line string state, a newline + ``` may close it
+_TOML_FENCE_TOKEN_RE = re.compile(r'"""|\n```')
+
 
 class RecommendationCategory(str, Enum):
     """Category types for recommendations."""
@@ -65,12 +73,40 @@ class Recommendation:
                 return f"prompt-{slug}.md"
 
 
+def find_toml_block_end(content: str, block_start: int) -> int:
+    """Find the closing fence of a TOML block that starts at block_start.
+
+    A ``` only ends the block if we're not inside a triple-quoted string and
+    it isn't the start of another fence with a language specifier. Jumps
+    between candidate tokens with a precompiled regex rather than testing
+    every character.
+
+    Args:
+        content: Markdown content
+        block_start: Index just past the opening ```toml line
+
+    Returns:
+        Index of the newline before the closing fence, or -1 if unclosed
+    """
+    in_triple_quote = False
+
+    for match in _TOML_FENCE_TOKEN_RE.finditer(content, block_start):
+        if match.group() == '"""':
+            in_triple_quote = not in_triple_quote
+        elif not in_triple_quote:
+            after_fence = match.end()
+            # Verify this isn't a language specifier like ```python
+            if after_fence >= len(content) or not content[after_fence].isalpha():
+                return match.start()
+
+    return -1
+
+
 def _extract_toml_blocks(content: str) -> list[str]:
     """Extract all TOML blocks from markdown content.
 
     Handles embedded ``` markers inside TOML multi-line strings by tracking
-    triple-quote state. A ``` only ends the TOML block if we're not inside
-    a triple-quoted string.
+    triple-quote state (see find_toml_block_end).
 
     Args:
         content: Markdown content with fenced TOML blocks
@@ -88,34 +124,7 @@ def _extract_toml_blocks(content: str) -> list[str]:
             break
 
         block_start = start + 8  # Skip past "```toml\n"
-
-        # Scan through the content tracking triple-quote state
-        # We're looking for ``` that's NOT inside a """ string
-        scan_pos = block_start
-        in_triple_quote = False
-        end = -1
-
-        while scan_pos < len(content):
-            # Check for triple quote (""")
-            if content[scan_pos : scan_pos + 3] == '"""':
-                in_triple_quote = not in_triple_quote
-                scan_pos += 3
-                continue
-
-            # Check for closing fence ``` (only valid if not in triple quote)
-            if not in_triple_quote and content[scan_pos : scan_pos + 4] == "\n```":
-                # Verify this isn't a language specifier like ```python
-                after_fence = scan_pos + 4
-                if after_fence >= len(content):
-                    end = scan_pos
-                    break
-                next_char = content[after_fence]
-                if not next_char.isalpha():
-                    # This is the closing fence
-                    end = scan_pos
-                    break
-
-            scan_pos += 1
+        end = find_toml_block_end(content, block_start)
 
         if end != -1:
             blocks.append(content[block_start:end])
@@ -134,6 +143,10 @@ def parse_recommendations_from_synthesis(synthesis_path: Path) -> list[Recommend
     recommendations. Each block is delimited by ```toml and ``` markers.
     All [[recommendations]] from all blocks are combined.
 
+    The parsed TOML is cached per (path, mtime, size), so repeated calls on an
+    unchanged file skip the block scan and TOML parse. Each call builds new
+    Recommendation objects, so callers may modify them freely.
+
     Args:
         synthesis_path: Path to the global-synthesis.md file
 
@@ -143,14 +156,45 @@ def parse_recommendations_from_synthesis(synthesis_path: Path) -> list[Recommend
     Raises:
         ValueError: If no valid TOML block is found
     """
-    content = synthesis_path.read_text()
+    stat = synthesis_path.stat()
+    records = _parse_synthesis_file(
+        str(synthesis_path), stat.st_mtime_ns, stat.st_size
+    )
+    return [_build_recommendation(rec_data) for rec_data in copy.deepcopy(records)]
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_synthesis_file(path: str, mtime_ns: int, size: int) -> tuple[dict, ...]:
+    """Read and parse a synthesis file; mtime_ns and size only key the cache.
+
+    Returns the raw [[recommendations]] tables. They are shared by every
+    caller of the cache and must be copied before use.
+    """
+    synthesis_path = Path(path)
+    return tuple(
+        _parse_recommendation_records(synthesis_path.read_text(), synthesis_path)
+    )
 
+
+def _parse_recommendation_records(content: str, source: Path) -> list[dict]:
+    """Parse the [[recommendations]] tables from synthesis markdown content.
+
+    Args:
+        content: Markdown content containing fenced TOML blocks
+        source: Path the content was read from (used in error messages)
+
+    Returns:
+        List of recommendation tables from all valid TOML blocks
+
+    Raises:
+        ValueError: If no valid TOML block is found
+    """
     # Extract all TOML blocks
     toml_blocks = _extract_toml_blocks(content)
 
     if not toml_blocks:
         raise ValueError(
-            f"No TOML block found in {synthesis_path}. "
+            f"No TOML block found in {source}. "
             "Ensure synthesis was generated with structured output enabled."
         )
 
@@ -174,26 +218,26 @@ def parse_recommendations_from_synthesis(synthesis_path: Path) -> list[Recommend
             )
         raise ValueError("No recommendations found in any TOML block")
 
-    recommendations = []
-    for rec_data in all_recommendations_data:
-        try:
-            category = RecommendationCategory(rec_data.get("category", "workflow"))
-        except ValueError:
-            category = RecommendationCategory.WORKFLOW
-
-        rec = Recommendation(
-            category=category,
-            title=rec_data.get("title", "Untitled"),
-            description=rec_data.get("description", ""),
-            evidence=rec_data.get("evidence", []),
-            estimated_impact=rec_data.get("estimated_impact"),
-            priority_score=rec_data.get("priority_score", 0.0),
-            content=rec_data.get("content", ""),
-            metadata=rec_data.get("metadata", {}),
-        )
-        recommendations.append(rec)
+    return all_recommendations_data
+
+
+def _build_recommendation(rec_data: dict) -> Recommendation:
+    """Build a Recommendation from one [[recommendations]] table."""
+    try:
+        category = RecommendationCategory(rec_data.get("category", "workflow"))
+    except ValueError:
+        category = RecommendationCategory.WORKFLOW
 
-    return recommendations
+    return Recommendation(
+        category=category,
+        title=rec_data.get("title", "Untitled"),
+        description=rec_data.get("description", ""),
+        evidence=rec_data.get("evidence", []),
+        estimated_impact=rec_data.get("estimated_impact"),
+        priority_score=rec_data.get("priority_score", 0.0),
+        content=rec_data.get("content", ""),
+        metadata=rec_data.get("metadata", {}),
+    )
 
 
 class RecommendationGenerator:
@@ -208,23 +252,37 @@ class RecommendationGenerator:
         self.output_dir = output_dir
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
-    def generate_all(self, recommendations: list[Recommendation]) -> list[Path]:
+    def generate_all(
+        self, recommendations: list[Recommendation], max_workers: int = 8
+    ) -> list[Path]:
         """Generate output files for all recommendations.
 
+        Files are written from a thread pool. Recommendations that map to the
+        same output file are handled in order by a single worker, so the last
+        one wins exactly as it would when writing serially.
+
         Args:
             recommendations: List of recommendations to generate
+            max_workers: Maximum number of files written concurrently
 
         Returns:
-            List of paths to generated files
+            List of paths to generated files, in recommendation order
         """
-        generated = []
+        indices_by_filename: dict[str, list[int]] = {}
+        for i, rec in enumerate(recommendations):
+            indices_by_filename.setdefault(rec.output_filename, []).append(i)
+
+        results: list[Optional[Path]] = [None] * len(recommendations)
 
-        for rec in recommendations:
-            path = self._generate_one(rec)
-            if path:
-                generated.append(path)
+        def generate_group(indices: list[int]) -> None:
+            for i in indices:
+                results[i] = self._generate_one(recommendations[i])
 
-        return generated
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Consuming the iterator re-raises any worker exception
+            list(executor.map(generate_group, indices_by_filename.values()))
+
+        return [path for path in results if path]
 
     def _generate_one(self, rec: Recommendation) -> Optional[Path]:
         """Generate output for a single recommendation."""
@@ -244,7 +302,8 @@ class RecommendationGenerator:
 
     def _generate_claude_md(self, rec: Recommendation) -> Path:
         """Generate CLAUDE.md snippet recommendation."""
-        output = f"""# CLAUDE.md Addition: {rec.title}
+        parts = [
+            f"""# CLAUDE.md Addition: {rec.title}
 
 ## Recommendation
 
@@ -259,23 +318,24 @@ class RecommendationGenerator:
 ## Evidence
 
 """
-        for e in rec.evidence:
-            output += f"- {e}\n"
+        ]
+        parts.extend(f"- {e}\n" for e in rec.evidence)
 
         if rec.estimated_impact:
-            output += (
+            parts.append(
                 f"\n## Estimated Impact\n\n~{rec.estimated_impact:,} tokens saved\n"
             )
 
         path = self.output_dir / rec.output_filename
-        path.write_text(output)
+        path.write_text("".join(parts))
         return path
 
     def _generate_skill(self, rec: Recommendation) -> Path:
         """Generate skill definition file."""
         skill_name = rec.metadata.get("skill_name", "custom-skill")
 
-        output = f"""# Skill Recommendation: /{skill_name}
+        parts = [
+            f"""# Skill Recommendation: /{skill_name}
 
 ## Description
 
@@ -292,21 +352,22 @@ Create `.claude/skills/{skill_name}/SKILL.md`:
 ## Evidence
 
 """
-        for e in rec.evidence:
-            output += f"- {e}\n"
+        ]
+        parts.extend(f"- {e}\n" for e in rec.evidence)
 
         if rec.estimated_impact:
-            output += (
+            parts.append(
                 f"\n## Estimated Impact\n\n~{rec.estimated_impact:,} tokens saved\n"
             )
 
         path = self.output_dir / rec.output_filename
-        path.write_text(output)
+        path.write_text("".join(parts))
         return path
 
     def _generate_hook(self, rec: Recommendation) -> Path:
         """Generate hook configuration recommendation."""
-        output = f"""# Hook Recommendation: {rec.title}
+        parts = [
+            f"""# Hook Recommendation: {rec.title}
 
 ## Description
 
@@ -323,17 +384,17 @@ Add to `.claude/settings.json`:
 ## Evidence
 
 """
-        for e in rec.evidence:
-            output += f"- {e}\n"
+        ]
+        parts.extend(f"- {e}\n" for e in rec.evidence)
 
         if rec.estimated_impact:
-            output += (
+            parts.append(
                 f"\n## Estimated Impact\n\n~{rec.estimated_impact:,} tokens saved\n"
             )
 
         # Check for helper script in metadata
         if helper_script := rec.metadata.get("helper_script"):
-            output += f"""
+            parts.append(f"""
 ## Helper Script
 
 {rec.metadata.get("helper_script_path", "Create helper script")}:
@@ -341,15 +402,16 @@ Add to `.claude/settings.json`:
 ```bash
 {helper_script}
 ```
-"""
+""")
 
         path = self.output_dir / rec.output_filename
-        path.write_text(output)
+        path.write_text("".join(parts))
         return path
 
     def _generate_mcp(self, rec: Recommendation) -> Path:
         """Generate MCP server recommendation."""
-        output = f"""# MCP Server Recommendation: {rec.title}
+        parts = [
+            f"""# MCP Server Recommendation: {rec.title}
 
 ## Description
 
@@ -364,26 +426,25 @@ Add to `.claude/settings.json`:
 ## Evidence
 
 """
-        for e in rec.evidence:
-            output += f"- {e}\n"
+        ]
+        parts.extend(f"- {e}\n" for e in rec.evidence)
 
         if env_vars := rec.metadata.get("env_vars"):
-            output += "\n## Required Environment Variables\n\n"
-            for var, desc in env_vars.items():
-                output += f"- `{var}`: {desc}\n"
+            parts.append("\n## Required Environment Variables\n\n")
+            parts.extend(f"- `{var}`: {desc}\n" for var, desc in env_vars.items())
 
         if usage := rec.metadata.get("usage_examples"):
-            output += "\n## Example Usage\n\n"
-            for example in usage:
-                output += f"- {example}\n"
+            parts.append("\n## Example Usage\n\n")
+            parts.extend(f"- {example}\n" for example in usage)
 
         path = self.output_dir / rec.output_filename
-        path.write_text(output)
+        path.write_text("".join(parts))
         return path
 
     def _generate_workflow(self, rec: Recommendation) -> Path:
         """Generate workflow guideline recommendation."""
-        output = f"""# Workflow Recommendation: {rec.title}
+        parts = [
+            f"""# Workflow Recommendation: {rec.title}
 
 ## Description
 
@@ -396,21 +457,22 @@ Add to `.claude/settings.json`:
 ## Evidence
 
 """
-        for e in rec.evidence:
-            output += f"- {e}\n"
+        ]
+        parts.extend(f"- {e}\n" for e in rec.evidence)
 
         if rec.estimated_impact:
-            output += (
+            parts.append(
                 f"\n## Estimated Impact\n\n~{rec.estimated_impact:,} tokens saved\n"
             )
 
         path = self.output_dir / rec.output_filename
-        path.write_text(output)
+        path.write_text("".join(parts))
         return path
 
     def _generate_prompt(self, rec: Recommendation) -> Path:
         """Generate prompt improvement recommendation."""
-        output = f"""# Prompt Improvement: {rec.title}
+        parts = [
+            f"""# Prompt Improvement: {rec.title}
 
 ## Description
 
@@ -423,9 +485,9 @@ Add to `.claude/settings.json`:
 ## Evidence
 
 """
-        for e in rec.evidence:
-            output += f"- {e}\n"
+        ]
+        parts.extend(f"- {e}\n" for e in rec.evidence)
 
         path = self.output_dir / rec.output_filename
-        path.write_text(output)
+        path.write_text("".join(parts))
         return path
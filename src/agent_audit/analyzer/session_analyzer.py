@@ -1,7 +1,21 @@
 """Session analyzer for per-project analysis using Claude."""
 
+import asyncio
+import contextlib
+import functools
+import hashlib
+import random
+from collections import OrderedDict
 from pathlib import Path
-from typing import Protocol
+from typing import AsyncGenerator, Callable, Optional, Protocol, TextIO
+
+
+# Heading where the project-independent instructions in session_analysis.md
+# begin; everything above it is per-project context
+SESSION_ANALYSIS_INSTRUCTIONS_HEADING = "## Session Quality Definitions"
+
+# Directory holding the prompt templates shipped with the package
+_PROMPTS_DIR = Path(__file__).resolve().parent.parent / "prompts"
 
 
 class ClaudeClient(Protocol):
@@ -11,6 +25,10 @@ class ClaudeClient(Protocol):
         """Send a query to Claude and return the response."""
         ...
 
+    def stream(self, prompt: str) -> AsyncGenerator[str, None]:
+        """Send a query to Claude and yield the response as it arrives."""
+        ...
+
 
 class DatabaseProtocol(Protocol):
     """Protocol for database interface."""
@@ -19,6 +37,10 @@ class DatabaseProtocol(Protocol):
         """Get metrics for a project."""
         ...
 
+    def get_project_metrics_batch(self, projects: list[str]) -> dict[str, dict]:
+        """Get metrics for several projects, keyed by project."""
+        ...
+
     def get_global_percentiles(self) -> dict:
         """Get global percentile statistics."""
         ...
@@ -28,48 +50,51 @@ class DatabaseProtocol(Protocol):
         ...
 
 
+@functools.lru_cache(maxsize=1)
 def load_session_analysis_template() -> str:
     """Load the session analysis prompt template.
 
+    Template loaders in this module read their file once per process and
+    return the cached string afterwards (use ``cache_clear()`` to reload).
+
     Returns:
         The template string with placeholders.
     """
-    template_path = Path(__file__).parent.parent / "prompts" / "session_analysis.md"
-    return template_path.read_text()
+    template_path = _PROMPTS_DIR / "session_analysis.md"
+    return template_path.read_text(encoding="utf-8")
 
 
+@functools.lru_cache(maxsize=1)
 def load_global_synthesis_template() -> str:
     """Load the global synthesis prompt template.
 
     Returns:
         The template string with placeholders.
     """
-    template_path = Path(__file__).parent.parent / "prompts" / "global_synthesis.md"
-    return template_path.read_text()
+    template_path = _PROMPTS_DIR / "global_synthesis.md"
+    return template_path.read_text(encoding="utf-8")
 
 
+@functools.lru_cache(maxsize=1)
 def load_best_practices_reference() -> str:
     """Load the best practices reference document.
 
     Returns:
         The best practices reference content.
     """
-    template_path = (
-        Path(__file__).parent.parent / "prompts" / "best_practices_reference.md"
-    )
-    return template_path.read_text()
+    template_path = _PROMPTS_DIR / "best_practices_reference.md"
+    return template_path.read_text(encoding="utf-8")
 
 
+@functools.lru_cache(maxsize=1)
 def load_validation_template() -> str:
     """Load the validation prompt template.
 
     Returns:
         The template string with placeholders.
     """
-    template_path = (
-        Path(__file__).parent.parent / "prompts" / "best_practices_validation.md"
-    )
-    return template_path.read_text()
+    template_path = _PROMPTS_DIR / "best_practices_validation.md"
+    return template_path.read_text(encoding="utf-8")
 
 
 def build_validation_prompt(synthesis_content: str) -> str:
@@ -89,14 +114,15 @@ def build_validation_prompt(synthesis_content: str) -> str:
     )
 
 
+@functools.lru_cache(maxsize=1)
 def load_fix_template() -> str:
     """Load the recommendation fix prompt template.
 
     Returns:
         The template string with placeholders.
     """
-    template_path = Path(__file__).parent.parent / "prompts" / "recommendation_fix.md"
-    return template_path.read_text()
+    template_path = _PROMPTS_DIR / "recommendation_fix.md"
+    return template_path.read_text(encoding="utf-8")
 
 
 def build_fix_prompt(original_toml: str, validation_issues: str) -> str:
@@ -157,9 +183,14 @@ def build_session_analysis_prompt(
     project_min_msgs: int,
     project_max_msgs: int,
     project_avg_tokens: int,
+    include_instructions: bool = True,
 ) -> str:
     """Build the session analysis prompt with metrics.
 
+    With include_instructions=False only the per-project context is returned,
+    followed by a pointer to the instructions, for clients that were given
+    build_session_analysis_instructions() as their system prompt.
+
     Args:
         project: Project name
         session_count: Number of sessions
@@ -176,11 +207,18 @@ def build_session_analysis_prompt(
         project_min_msgs: Project minimum message count
         project_max_msgs: Project maximum message count
         project_avg_tokens: Project average output tokens
+        include_instructions: Whether to include the analysis instructions
 
     Returns:
         Formatted prompt string.
     """
     template = load_session_analysis_template()
+    if not include_instructions:
+        start = template.index(SESSION_ANALYSIS_INSTRUCTIONS_HEADING)
+        template = (
+            template[:start]
+            + "Follow the session analysis instructions in your system prompt.\n"
+        )
 
     return template.format(
         project=project,
@@ -201,6 +239,25 @@ def build_session_analysis_prompt(
     )
 
 
+def build_session_analysis_instructions(global_p75_msgs: int) -> str:
+    """Build the project-independent part of the session analysis prompt.
+
+    This is the template from the quality definitions onwards. It depends
+    only on global baselines, so it is identical for every project in a run
+    and can be sent once as a system prompt (a cached prefix) rather than
+    repeated in each per-project query.
+
+    Args:
+        global_p75_msgs: Global P75 message count
+
+    Returns:
+        Formatted instructions string.
+    """
+    template = load_session_analysis_template()
+    start = template.index(SESSION_ANALYSIS_INSTRUCTIONS_HEADING)
+    return template[start:].format(global_p75_msgs=global_p75_msgs)
+
+
 class SessionAnalyzer:
     """Analyzes project sessions using Claude.
 
@@ -213,6 +270,8 @@ class SessionAnalyzer:
         client: ClaudeClient,
         db: DatabaseProtocol,
         toml_dir: Path,
+        instructions_in_system_prompt: bool = False,
+        cache_size: int = 64,
     ):
         """Initialize the session analyzer.
 
@@ -220,30 +279,159 @@ class SessionAnalyzer:
             client: Claude client for making queries
             db: Database for fetching metrics
             toml_dir: Base directory for TOML transcripts
+            instructions_in_system_prompt: Set when the client's system prompt
+                already holds build_session_analysis_instructions(), so
+                per-project queries only send the project context
+            cache_size: Maximum number of analyses kept for reuse; the least
+                recently used are evicted first
         """
         self.client = client
         self.db = db
         self.toml_dir = toml_dir
-
-    async def analyze_project(self, project: str) -> str:
+        self.instructions_in_system_prompt = instructions_in_system_prompt
+        self.cache_size = cache_size
+        # Analyses keyed by (project, prompt digest), least recently used
+        # first; the prompt carries every metric, so unchanged inputs reuse
+        # the earlier answer
+        self._analysis_cache: OrderedDict[tuple[str, str], str] = OrderedDict()
+        # Locks for keys with calls in flight, and how many calls hold each
+        self._analysis_locks: dict[tuple[str, str], asyncio.Lock] = {}
+        self._analysis_lock_users: dict[tuple[str, str], int] = {}
+
+    async def analyze_project(
+        self,
+        project: str,
+        metrics: Optional[dict] = None,
+        global_percentiles: Optional[dict] = None,
+    ) -> str:
         """Analyze sessions for a single project.
 
+        Repeated calls whose prompt is unchanged return the cached analysis
+        without querying Claude again. Concurrent duplicate calls wait for the
+        first one instead of issuing their own query.
+
+        Args:
+            project: Project name to analyze
+            metrics: Project metrics already fetched from the database
+                (fetched here if not given)
+            global_percentiles: get_global_percentiles() result already
+                fetched from the database (fetched here if not given)
+
+        Returns:
+            Markdown analysis content.
+        """
+        prompt = self._build_project_prompt(project, metrics, global_percentiles)
+        return await self._query_cached(project, prompt)
+
+    async def analyze_project_stream(
+        self,
+        project: str,
+        sink: TextIO,
+        metrics: Optional[dict] = None,
+        global_percentiles: Optional[dict] = None,
+    ) -> str:
+        """Analyze sessions for a single project, writing output as it arrives.
+
+        The sink is flushed after every chunk. Shares analyze_project's
+        cache: a cached analysis is written to the sink in one piece instead
+        of querying Claude again.
+
         Args:
             project: Project name to analyze
+            sink: File-like object the markdown analysis is written to
+            metrics: Project metrics already fetched from the database
+                (fetched here if not given)
+            global_percentiles: get_global_percentiles() result already
+                fetched from the database (fetched here if not given)
+
+        Returns:
+            The complete markdown analysis written to the sink.
+        """
+        prompt = self._build_project_prompt(project, metrics, global_percentiles)
+        return await self._query_cached(project, prompt, sink)
+
+    async def _query_cached(
+        self, project: str, prompt: str, sink: Optional[TextIO] = None
+    ) -> str:
+        """Query Claude for a project prompt, reusing identical earlier queries.
+
+        Args:
+            project: Project the prompt belongs to
+            prompt: Session analysis prompt
+            sink: File-like object to stream the response into, if any
 
         Returns:
             Markdown analysis content.
         """
+        digest = hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest()
+        key = (project, digest)
+
+        lock = self._analysis_locks.get(key)
+        if lock is None:
+            lock = self._analysis_locks[key] = asyncio.Lock()
+        self._analysis_lock_users[key] = self._analysis_lock_users.get(key, 0) + 1
+        try:
+            async with lock:
+                result = self._analysis_cache.get(key)
+                if result is not None:
+                    self._analysis_cache.move_to_end(key)
+                    if sink is not None:
+                        sink.write(result)
+                    return result
+
+                # Query Claude; failures are not cached
+                if sink is None:
+                    result = await self.client.query(prompt)
+                else:
+                    chunks = []
+                    # aclosing drains the response if sink.write fails
+                    async with contextlib.aclosing(
+                        self.client.stream(prompt)
+                    ) as response:
+                        async for chunk in response:
+                            sink.write(chunk)
+                            sink.flush()
+                            chunks.append(chunk)
+                    result = "".join(chunks)
+
+                self._analysis_cache[key] = result
+                while len(self._analysis_cache) > self.cache_size:
+                    self._analysis_cache.popitem(last=False)
+                return result
+        finally:
+            # Forget the lock once no call for this key is in flight
+            self._analysis_lock_users[key] -= 1
+            if not self._analysis_lock_users[key]:
+                del self._analysis_lock_users[key]
+                del self._analysis_locks[key]
+
+    def _build_project_prompt(
+        self,
+        project: str,
+        metrics: Optional[dict],
+        global_percentiles: Optional[dict],
+    ) -> str:
+        """Build the session analysis prompt for a project.
+
+        Args:
+            project: Project name to analyze
+            metrics: Project metrics, or None to fetch them
+            global_percentiles: Global percentiles, or None to fetch them
+
+        Returns:
+            Formatted prompt string.
+        """
         # Get project metrics from database
-        metrics = self.db.get_project_metrics(project)
+        if metrics is None:
+            metrics = self.db.get_project_metrics(project)
 
         # Get global percentiles and project-specific stats
-        global_percentiles = self.db.get_global_percentiles()
+        if global_percentiles is None:
+            global_percentiles = self.db.get_global_percentiles()
         project_stats = self.db.get_project_session_stats(project)
 
-        # Build the prompt
         project_toml_dir = self.toml_dir / project
-        prompt = build_session_analysis_prompt(
+        return build_session_analysis_prompt(
             project=project,
             session_count=metrics["session_count"],
             turn_count=metrics["turn_count"],
@@ -259,10 +447,105 @@ class SessionAnalyzer:
             project_min_msgs=project_stats["min_msgs"],
             project_max_msgs=project_stats["max_msgs"],
             project_avg_tokens=project_stats["avg_tokens"],
+            include_instructions=not self.instructions_in_system_prompt,
         )
 
-        # Query Claude and return the response
-        return await self.client.query(prompt)
+    async def analyze_projects(
+        self,
+        projects: list[str],
+        concurrency: int = 4,
+        max_retries: int = 3,
+        retry_base_delay: float = 1.0,
+        metrics_by_project: Optional[dict[str, dict]] = None,
+        global_percentiles: Optional[dict] = None,
+        output_dir: Optional[Path] = None,
+        on_result: Optional[Callable[[str, str | Exception], None]] = None,
+    ) -> dict[str, str | BaseException]:
+        """Analyze several projects concurrently.
+
+        At most ``concurrency`` analyses are in flight at once. Errors that
+        set ``retryable`` (rate limits and server errors from
+        AnalyzerClaudeClient) are retried with exponential backoff and jitter.
+        A failure in one project does not stop the others; its exception is
+        returned in place of the markdown. ``on_result`` sees each project as
+        soon as it finishes, so callers can save work without waiting for
+        the rest of the batch.
+
+        With ``output_dir``, each analysis is streamed into
+        ``<project>.md`` there as Claude produces it. A retry starts the file
+        over, and a project that fails or is cancelled leaves no file behind.
+
+        Args:
+            projects: Project names to analyze
+            concurrency: Maximum number of concurrent Claude queries
+            max_retries: Retries per project after a retryable error
+            retry_base_delay: Seconds before the first retry; doubles after
+                each further attempt
+            metrics_by_project: get_project_metrics_batch() result already
+                fetched for these projects (fetched here if not given)
+            global_percentiles: get_global_percentiles() result already
+                fetched from the database (fetched here if not given)
+            output_dir: Directory to stream each analysis into
+            on_result: Called with the project name and its markdown, or the
+                exception that ended its analysis, as each project finishes
+
+        Returns:
+            Dict mapping project name to markdown analysis or the exception
+            raised while analyzing it, in the order given.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        # Shared inputs are read once for the whole batch
+        if metrics_by_project is None:
+            metrics_by_project = self.db.get_project_metrics_batch(projects)
+        if global_percentiles is None:
+            global_percentiles = self.db.get_global_percentiles()
+
+        async def analyze(project: str) -> str:
+            try:
+                result = await analyze_with_retries(project)
+            except Exception as e:
+                if on_result is not None:
+                    on_result(project, e)
+                raise
+            if on_result is not None:
+                on_result(project, result)
+            return result
+
+        async def analyze_with_retries(project: str) -> str:
+            async with semaphore:
+                attempt = 0
+                while True:
+                    try:
+                        return await analyze_once(project)
+                    except Exception as e:
+                        retryable = getattr(e, "retryable", False)
+                        if attempt >= max_retries or not retryable:
+                            raise
+                    delay = retry_base_delay * 2**attempt
+                    await asyncio.sleep(delay + random.uniform(0, retry_base_delay))
+                    attempt += 1
+
+        async def analyze_once(project: str) -> str:
+            kwargs = {
+                "metrics": metrics_by_project[project],
+                "global_percentiles": global_percentiles,
+            }
+            if output_dir is None:
+                return await self.analyze_project(project, **kwargs)
+
+            output_path = output_dir / f"{project}.md"
+            try:
+                with output_path.open("w", encoding="utf-8") as sink:
+                    return await self.analyze_project_stream(project, sink, **kwargs)
+            except BaseException:
+                # Don't leave a truncated analysis for synthesis to pick up
+                output_path.unlink(missing_ok=True)
+                raise
+
+        results = await asyncio.gather(
+            *(analyze(project) for project in projects), return_exceptions=True
+        )
+        return dict(zip(projects, results))
 
     async def synthesize_global(self, analysis_dir: Path) -> str:
         """Synthesize cross-project patterns from per-project analyses.
@@ -625,6 +625,7 @@ def render(
                     )
                 )
 
+            messages_by_id = {message.id: message for message in messages}
             tool_calls = []
             for tc in db.get_tool_calls_for_session(session_dict["id"]):
                 tool_call = ToolCall(
@@ -637,10 +638,9 @@ def render(
                 )
                 tool_calls.append(tool_call)
                 # Attach to message
-                for message in messages:
-                    if message.id == tc["message_id"]:
-                        message.tool_calls.append(tool_call)
-                        break
+                parent = messages_by_id.get(tc["message_id"])
+                if parent is not None:
+                    parent.tool_calls.append(tool_call)
 
             tool_results = []
             for tr in db.get_tool_results_for_session(session_dict["id"]):
@@ -789,12 +789,20 @@ def config(ctx, archive_dir: Optional[Path], projects_dir: Optional[Path], show:
     default=None,
     help="Generate actionable recommendations from a synthesis file",
 )
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="Number of projects to analyze in parallel",
+)
 @click.pass_context
 def analyze(
     ctx,
     archive_dir: Optional[Path],
     synthesize: Optional[Path],
     recommend: Optional[Path],
+    concurrency: int,
 ):
     """Analyze archived sessions for patterns and insights.
 
@@ -819,14 +827,18 @@ def analyze(
     if synthesize:
         _run_global_synthesis(ctx, cfg, synthesize)
     else:
-        _run_session_analysis(ctx, cfg)
+        _run_session_analysis(ctx, cfg, concurrency)
 
 
-def _run_session_analysis(ctx, cfg: Config):
+def _run_session_analysis(ctx, cfg: Config, concurrency: int = 4):
     """Run per-project session analysis."""
     import asyncio
-    from .analyzer.session_analyzer import SessionAnalyzer
-    from .analyzer.claude_client import AnalyzerClaudeClient
+    from claude_agent_sdk import ClaudeAgentOptions
+    from .analyzer.session_analyzer import (
+        SessionAnalyzer,
+        build_session_analysis_instructions,
+    )
+    from .analyzer.claude_client import AnalyzerClaudeClientPool
 
     db = Database(cfg.db_path)
 
@@ -844,36 +856,63 @@ def _run_session_analysis(ctx, cfg: Config):
     click.echo()
 
     async def run_analysis():
-        async with AnalyzerClaudeClient() as client:
-            with db:
-                analyzer = SessionAnalyzer(
-                    client=client,
-                    db=db,
-                    toml_dir=cfg.toml_dir,
+        with db:
+            metrics_by_project = db.get_project_metrics_batch(projects)
+            to_analyze = []
+            for i, project in enumerate(projects, 1):
+                click.echo(f"Project {i}/{len(projects)}: {project}")
+
+                # Check if project has sessions
+                metrics = metrics_by_project[project]
+                if metrics["session_count"] == 0:
+                    click.echo("  Skipping (no sessions)")
+                    continue
+
+                click.echo(
+                    f"  Sessions: {metrics['session_count']}, Turns: {metrics['turn_count']}"
                 )
+                to_analyze.append(project)
 
-                for i, project in enumerate(projects, 1):
-                    click.echo(f"Analyzing project {i}/{len(projects)}: {project}...")
+            if not to_analyze:
+                return
 
-                    # Check if project has sessions
-                    metrics = db.get_project_metrics(project)
-                    if metrics["session_count"] == 0:
-                        click.echo("  Skipping (no sessions)")
-                        continue
+            pool_size = min(concurrency, len(to_analyze))
+            click.echo()
+            click.echo(
+                f"Analyzing {len(to_analyze)} projects ({pool_size} at a time)..."
+            )
 
-                    click.echo(
-                        f"  Sessions: {metrics['session_count']}, Turns: {metrics['turn_count']}"
-                    )
+            # The analysis instructions are the same for every project, so
+            # send them once as the system prompt instead of in each query
+            global_percentiles = db.get_global_percentiles()
+            options = ClaudeAgentOptions(
+                system_prompt=build_session_analysis_instructions(
+                    global_p75_msgs=global_percentiles["p75_msgs"]
+                )
+            )
 
-                    try:
-                        result = await analyzer.analyze_project(project)
+            def report_result(project: str, result) -> None:
+                # Analyses stream into run_dir; report each one as it finishes
+                if isinstance(result, BaseException):
+                    click.echo(f"  {project}: Error: {result}")
+                else:
+                    click.echo(f"  Written: {run_dir / f'{project}.md'}")
 
-                        # Write output
-                        output_path = run_dir / f"{project}.md"
-                        output_path.write_text(result)
-                        click.echo(f"  Written: {output_path}")
-                    except Exception as e:
-                        click.echo(f"  Error: {e}")
+            async with AnalyzerClaudeClientPool(pool_size, options) as client:
+                analyzer = SessionAnalyzer(
+                    client=client,
+                    db=db,
+                    toml_dir=cfg.toml_dir,
+                    instructions_in_system_prompt=True,
+                )
+                await analyzer.analyze_projects(
+                    to_analyze,
+                    concurrency=pool_size,
+                    metrics_by_project={p: metrics_by_project[p] for p in to_analyze},
+                    global_percentiles=global_percentiles,
+                    output_dir=run_dir,
+                    on_result=report_result,
+                )
 
     try:
         asyncio.run(run_analysis())
@@ -944,74 +983,38 @@ def _format_validation_issues(data: dict) -> str:
 
 def _extract_toml_from_synthesis(synthesis_content: str) -> Optional[str]:
     """Extract the TOML block from synthesis markdown."""
+    from .analyzer.recommendations import find_toml_block_end
+
     toml_start = synthesis_content.find("```toml\n")
     if toml_start == -1:
         return None
 
     # Find the end - need to handle embedded ``` in multi-line strings
-    # Use triple-quote tracking like the recommendations parser
     block_start = toml_start + 8
-    scan_pos = block_start
-    in_triple_quote = False
-
-    while scan_pos < len(synthesis_content):
-        if synthesis_content[scan_pos : scan_pos + 3] == '"""':
-            in_triple_quote = not in_triple_quote
-            scan_pos += 3
-            continue
-
-        if (
-            not in_triple_quote
-            and synthesis_content[scan_pos : scan_pos + 4] == "\n```"
-        ):
-            after_fence = scan_pos + 4
-            if (
-                after_fence >= len(synthesis_content)
-                or not synthesis_content[after_fence].isalpha()
-            ):
-                return synthesis_content[block_start:scan_pos]
-
-        scan_pos += 1
+    toml_end = find_toml_block_end(synthesis_content, block_start)
+    if toml_end == -1:
+        return None
 
-    return None
+    return synthesis_content[block_start:toml_end]
 
 
 def _replace_toml_in_synthesis(synthesis_content: str, new_toml: str) -> str:
     """Replace the TOML block in synthesis with new content."""
+    from .analyzer.recommendations import find_toml_block_end
+
     toml_start = synthesis_content.find("```toml\n")
     if toml_start == -1:
         return synthesis_content
 
     # Find the end using same logic as extract
-    block_start = toml_start + 8
-    scan_pos = block_start
-    in_triple_quote = False
-
-    while scan_pos < len(synthesis_content):
-        if synthesis_content[scan_pos : scan_pos + 3] == '"""':
-            in_triple_quote = not in_triple_quote
-            scan_pos += 3
-            continue
-
-        if (
-            not in_triple_quote
-            and synthesis_content[scan_pos : scan_pos + 4] == "\n```"
-        ):
-            after_fence = scan_pos + 4
-            if (
-                after_fence >= len(synthesis_content)
-                or not synthesis_content[after_fence].isalpha()
-            ):
-                # Found the end
-                toml_end = scan_pos
-                # Reconstruct with new TOML
-                before = synthesis_content[:toml_start]
-                after = synthesis_content[toml_end + 4 :]  # Skip \n```
-                return f"{before}```toml\n{new_toml}\n```{after}"
-
-        scan_pos += 1
+    toml_end = find_toml_block_end(synthesis_content, toml_start + 8)
+    if toml_end == -1:
+        return synthesis_content
 
-    return synthesis_content
+    # Reconstruct with new TOML
+    before = synthesis_content[:toml_start]
+    after = synthesis_content[toml_end + 4 :]  # Skip \n```
+    return f"{before}```toml\n{new_toml}\n```{after}"
 
 
 def _summarize_validation(validation_content: str) -> tuple[Optional[dict], bool]:
@@ -1060,7 +1063,7 @@ def _run_global_synthesis(ctx, cfg: Config, analysis_dir: Path):
     """Run global synthesis on existing per-project analyses."""
     import asyncio
     from .analyzer.session_analyzer import SessionAnalyzer
-    from .analyzer.claude_client import AnalyzerClaudeClient
+    from .analyzer.claude_client import AnalyzerClaudeClient, ClaudeQueryError
 
     # Count analysis files (excluding synthesis and validation outputs)
     analysis_files = [
@@ -1171,7 +1174,7 @@ def _run_global_synthesis(ctx, cfg: Config, analysis_dir: Path):
                         output_path.write_text(result)
                         click.echo(f"Updated: {output_path}")
 
-                except ValueError as e:
+                except (ValueError, ClaudeQueryError) as e:
                     click.echo(f"Error: {e}")
 
     try:
@@ -137,8 +137,15 @@ class Database:
     """SQLite database for storing archived sessions."""
 
     def __init__(self, db_path: Path):
+        """Initialize the database.
+
+        Args:
+            db_path: Path to the SQLite file, or Path(":memory:") for a
+                private in-memory database that lives until close()
+        """
         self.db_path = db_path
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        if str(db_path) != ":memory:":
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self.conn: Optional[sqlite3.Connection] = None
 
     def connect(self) -> sqlite3.Connection:
@@ -304,7 +311,7 @@ class Database:
         """Get all session IDs in the database."""
         conn = self.connect()
         cursor = conn.execute("SELECT id FROM sessions")
-        return [row["id"] for row in cursor.fetchall()]
+        return [row["id"] for row in cursor]
 
     def get_sessions_by_project(self, project: str) -> list[dict]:
         """Get all sessions for a project."""
@@ -313,7 +320,7 @@ class Database:
             "SELECT * FROM sessions WHERE project = ? ORDER BY started_at DESC",
             (project,),
         )
-        return [dict(row) for row in cursor.fetchall()]
+        return [dict(row) for row in cursor]
 
     def get_sessions_by_date_range(self, start_date: str, end_date: str) -> list[dict]:
         """Get sessions within a date range."""
@@ -326,13 +333,13 @@ class Database:
             """,
             (start_date, end_date),
         )
-        return [dict(row) for row in cursor.fetchall()]
+        return [dict(row) for row in cursor]
 
     def get_all_sessions(self) -> list[dict]:
         """Get all sessions."""
         conn = self.connect()
         cursor = conn.execute("SELECT * FROM sessions ORDER BY started_at DESC")
-        return [dict(row) for row in cursor.fetchall()]
+        return [dict(row) for row in cursor]
 
     def get_messages_for_session(self, session_id: str) -> list[dict]:
         """Get all messages for a session ordered by timestamp."""
@@ -341,34 +348,34 @@ class Database:
             "SELECT * FROM messages WHERE session_id = ? ORDER BY timestamp",
             (session_id,),
         )
-        return [dict(row) for row in cursor.fetchall()]
+        return [dict(row) for row in cursor]
 
     def get_tool_calls_for_session(self, session_id: str) -> list[dict]:
-        """Get all tool calls for a session."""
+        """Get all tool calls for a session ordered by timestamp."""
         conn = self.connect()
         cursor = conn.execute(
             "SELECT * FROM tool_calls WHERE session_id = ? ORDER BY timestamp",
             (session_id,),
         )
-        return [dict(row) for row in cursor.fetchall()]
+        return [dict(row) for row in cursor]
 
     def get_tool_results_for_session(self, session_id: str) -> list[dict]:
-        """Get all tool results for a session."""
+        """Get all tool results for a session ordered by timestamp."""
         conn = self.connect()
         cursor = conn.execute(
             "SELECT * FROM tool_results WHERE session_id = ? ORDER BY timestamp",
             (session_id,),
         )
-        return [dict(row) for row in cursor.fetchall()]
+        return [dict(row) for row in cursor]
 
     def get_commits_for_session(self, session_id: str) -> list[dict]:
-        """Get all commits for a session."""
+        """Get all commits for a session ordered by timestamp."""
         conn = self.connect()
         cursor = conn.execute(
             "SELECT * FROM commits WHERE session_id = ? ORDER BY timestamp",
             (session_id,),
         )
-        return [dict(row) for row in cursor.fetchall()]
+        return [dict(row) for row in cursor]
 
     def get_sessions_by_repo(self, repo: str) -> list[dict]:
         """Get all sessions associated with a repo (owner/name)."""
@@ -377,7 +384,7 @@ class Database:
             "SELECT * FROM sessions WHERE repo = ? ORDER BY started_at DESC",
             (repo,),
         )
-        return [dict(row) for row in cursor.fetchall()]
+        return [dict(row) for row in cursor]
 
     def get_sessions_by_github_repo(self, github_repo: str) -> list[dict]:
         """Deprecated: use ``get_sessions_by_repo`` instead."""
@@ -410,12 +417,12 @@ class Database:
         stats["total_output_tokens"] = row["total"] or 0
 
         cursor = conn.execute("SELECT DISTINCT project FROM sessions")
-        stats["projects"] = [row["project"] for row in cursor.fetchall()]
+        stats["projects"] = [row["project"] for row in cursor]
 
         cursor = conn.execute(
             "SELECT DISTINCT repo FROM sessions WHERE repo IS NOT NULL"
         )
-        stats["repos"] = [row["repo"] for row in cursor.fetchall()]
+        stats["repos"] = [row["repo"] for row in cursor]
         # Deprecated alias
         stats["github_repos"] = stats["repos"]
 
@@ -428,7 +435,7 @@ class Database:
             "SELECT * FROM sessions WHERE parent_session_id = ? ORDER BY started_at",
             (parent_session_id,),
         )
-        return [dict(row) for row in cursor.fetchall()]
+        return [dict(row) for row in cursor]
 
     def get_session_tree(self, session_id: str) -> dict:
         """Get a session and all its descendants as a tree structure.
@@ -456,7 +463,7 @@ class Database:
         cursor = conn.execute(
             "SELECT * FROM sessions WHERE parent_session_id IS NULL ORDER BY started_at DESC"
         )
-        return [dict(row) for row in cursor.fetchall()]
+        return [dict(row) for row in cursor]
 
     def get_project_metrics(self, project: str) -> dict:
         """Get aggregate metrics for a project.
@@ -468,55 +475,82 @@ class Database:
             - total_output_tokens: sum of output tokens across sessions
             - tool_call_count: total tool calls
         """
+        return self.get_project_metrics_batch([project])[project]
+
+    def get_project_metrics_batch(self, projects: list[str]) -> dict[str, dict]:
+        """Get aggregate metrics for several projects at once.
+
+        Runs one grouped query per metric instead of one set of queries per
+        project. Projects without sessions get all-zero metrics.
+
+        Returns dict mapping each project to the same metrics dict as
+        get_project_metrics.
+        """
+        metrics = {
+            project: {
+                "session_count": 0,
+                "turn_count": 0,
+                "total_input_tokens": 0,
+                "total_output_tokens": 0,
+                "tool_call_count": 0,
+            }
+            for project in projects
+        }
+        if not metrics:
+            return metrics
+
         conn = self.connect()
+        placeholders = ", ".join("?" * len(metrics))
+        params = list(metrics)
 
         # Session count and token totals
         cursor = conn.execute(
-            """
+            f"""
             SELECT
+                project,
                 COUNT(*) as session_count,
                 COALESCE(SUM(total_input_tokens), 0) as total_input_tokens,
                 COALESCE(SUM(total_output_tokens), 0) as total_output_tokens
-            FROM sessions WHERE project = ?
+            FROM sessions WHERE project IN ({placeholders})
+            GROUP BY project
             """,
-            (project,),
+            params,
         )
-        row = cursor.fetchone()
-        session_count = row["session_count"]
-        total_input_tokens = row["total_input_tokens"]
-        total_output_tokens = row["total_output_tokens"]
+        for row in cursor:
+            project_metrics = metrics[row["project"]]
+            project_metrics["session_count"] = row["session_count"]
+            project_metrics["total_input_tokens"] = row["total_input_tokens"]
+            project_metrics["total_output_tokens"] = row["total_output_tokens"]
 
         # Turn count: count user messages (each user message pairs with an assistant response)
         cursor = conn.execute(
-            """
-            SELECT COUNT(*) as turn_count
+            f"""
+            SELECT s.project, COUNT(*) as turn_count
             FROM messages m
             JOIN sessions s ON m.session_id = s.id
-            WHERE s.project = ? AND m.type = 'user'
+            WHERE s.project IN ({placeholders}) AND m.type = 'user'
+            GROUP BY s.project
             """,
-            (project,),
+            params,
         )
-        turn_count = cursor.fetchone()["turn_count"]
+        for row in cursor:
+            metrics[row["project"]]["turn_count"] = row["turn_count"]
 
         # Tool call count
         cursor = conn.execute(
-            """
-            SELECT COUNT(*) as tool_call_count
+            f"""
+            SELECT s.project, COUNT(*) as tool_call_count
             FROM tool_calls tc
             JOIN sessions s ON tc.session_id = s.id
-            WHERE s.project = ?
+            WHERE s.project IN ({placeholders})
+            GROUP BY s.project
             """,
-            (project,),
+            params,
         )
-        tool_call_count = cursor.fetchone()["tool_call_count"]
+        for row in cursor:
+            metrics[row["project"]]["tool_call_count"] = row["tool_call_count"]
 
-        return {
-            "session_count": session_count,
-            "turn_count": turn_count,
-            "total_input_tokens": total_input_tokens,
-            "total_output_tokens": total_output_tokens,
-            "tool_call_count": tool_call_count,
-        }
+        return metrics
 
     def get_warmup_stats(self) -> dict:
         """Get statistics about warmup/sidechain sessions."""
@@ -388,7 +388,8 @@ def _analyze_tool_patterns(tool_calls: list[dict]) -> dict:
             "top_trigrams": [],
         }
 
-    counter: Counter = Counter(tc["tool_name"] for tc in tool_calls)
+    tool_names = [tc["tool_name"] for tc in tool_calls]
+    counter: Counter = Counter(tool_names)
     total = len(tool_calls)
 
     top = counter.most_common(1)[0]
@@ -397,11 +398,10 @@ def _analyze_tool_patterns(tool_calls: list[dict]) -> dict:
         f"({top[1]}/{total} calls, {top[1] * 100 // total}%)"
     )
 
-    # 3-grams of tool sequences
-    tool_names = [tc["tool_name"] for tc in tool_calls]
-    trigram_counter: Counter = Counter()
-    for i in range(len(tool_names) - 2):
-        trigram_counter[(tool_names[i], tool_names[i + 1], tool_names[i + 2])] += 1
+    # 3-grams of tool sequences, counted in C by zipping shifted views
+    trigram_counter: Counter = Counter(
+        zip(tool_names, tool_names[1:], tool_names[2:])
+    )
 
     top_trigrams = trigram_counter.most_common(5)
 
@@ -838,9 +838,7 @@ def build_metrics_summary(
     cache_read_tokens = primary_session.get("total_cache_read_tokens") or 0
 
     # Tool usage breakdown
-    tool_counter: Counter = Counter()
-    for tc in tool_calls:
-        tool_counter[tc["tool_name"]] += 1
+    tool_counter: Counter = Counter(tc["tool_name"] for tc in tool_calls)
 
     # Timeline
     started = primary_session.get("started_at") or "unknown"
@@ -1076,6 +1074,7 @@ def _reconstruct_session_from_db(db: Database, session_dict: dict) -> Session:
             )
         )
 
+    messages_by_id = {message.id: message for message in messages}
     tool_calls: list[ToolCall] = []
     for tc in db.get_tool_calls_for_session(session_id):
         tool_call = ToolCall(
@@ -1087,10 +1086,9 @@ def _reconstruct_session_from_db(db: Database, session_dict: dict) -> Session:
             timestamp=tc["timestamp"],
         )
         tool_calls.append(tool_call)
-        for message in messages:
-            if message.id == tc["message_id"]:
-                message.tool_calls.append(tool_call)
-                break
+        parent = messages_by_id.get(tc["message_id"])
+        if parent is not None:
+            parent.tool_calls.append(tool_call)
 
     tool_results: list[ToolResult] = []
     for tr in db.get_tool_results_for_session(session_id):
@@ -35,7 +35,7 @@ def detect_platform(hostname: str) -> str | None:
     return KNOWN_PLATFORMS.get(hostname.lower())
 
 
-@dataclass
+@dataclass(slots=True)
 class Commit:
     """Represents a git commit extracted from tool results."""
 
@@ -46,7 +46,7 @@ class Commit:
     timestamp: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolCall:
     """Represents a tool call made by the assistant."""
 
@@ -58,7 +58,7 @@ class ToolCall:
     timestamp: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolResult:
     """Represents the result of a tool call."""
 
@@ -70,7 +70,7 @@ class ToolResult:
     timestamp: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     """Represents a message in a session."""
 
@@ -91,7 +91,7 @@ class Message:
     tool_calls: list[ToolCall] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class Session:
     """Represents a coding agent session (Claude Code, Codex, etc.)."""
 
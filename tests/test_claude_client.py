@@ -1,8 +1,17 @@
-"""Tests for Claude client JSON extraction."""
+"""Tests for Claude client JSON extraction, streaming and client pooling."""
+
+import asyncio
+import contextlib
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from claude_agent_sdk import AssistantMessage, ResultMessage, TextBlock
 
-from agent_audit.analyzer.claude_client import AnalyzerClaudeClient
+from agent_audit.analyzer.claude_client import (
+    AnalyzerClaudeClient,
+    AnalyzerClaudeClientPool,
+    ClaudeQueryError,
+)
 
 
 class TestExtractJson:
@@ -34,3 +43,198 @@ class TestParseJsonResponse:
     def test_raises_valueerror_on_invalid_json(self):
         with pytest.raises(ValueError, match="Failed to parse JSON"):
             AnalyzerClaudeClient.parse_json_response("not json at all {{{")
+
+
+def _result(is_error=False, api_error_status=None):
+    return ResultMessage(
+        subtype="success",
+        duration_ms=1,
+        duration_api_ms=1,
+        is_error=is_error,
+        num_turns=1,
+        session_id="s",
+        api_error_status=api_error_status,
+    )
+
+
+class FakeSDKClient:
+    """One SDK conversation: responses queue up until they are read."""
+
+    def __init__(self, replies):
+        self.replies = replies
+        self.pending = []
+
+    async def query(self, prompt):
+        for text in self.replies[prompt]:
+            self.pending.append(AssistantMessage(content=[TextBlock(text)], model="m"))
+        self.pending.append(_result())
+
+    async def receive_response(self):
+        while self.pending:
+            message = self.pending.pop(0)
+            yield message
+            if isinstance(message, ResultMessage):
+                return
+
+
+def _client_with_session(replies):
+    client = AnalyzerClaudeClient()
+    client.client = FakeSDKClient(replies)
+    client._connected = True
+    return client
+
+
+class TestStream:
+    @staticmethod
+    def connected_client(messages):
+        async def receive_response():
+            for message in messages:
+                yield message
+
+        client = AnalyzerClaudeClient()
+        client.client = MagicMock()
+        client.client.query = AsyncMock()
+        client.client.receive_response = receive_response
+        client._connected = True
+        return client
+
+    @pytest.mark.asyncio
+    async def test_yields_text_blocks_in_order(self):
+        client = self.connected_client(
+            [
+                AssistantMessage(content=[TextBlock("Hello")], model="m"),
+                MagicMock(),
+                AssistantMessage(
+                    content=[TextBlock(", "), TextBlock("world")], model="m"
+                ),
+            ]
+        )
+
+        chunks = [chunk async for chunk in client.stream("hi")]
+
+        assert chunks == ["Hello", ", ", "world"]
+        client.client.query.assert_awaited_once_with("hi")
+
+    @pytest.mark.asyncio
+    async def test_query_joins_stream(self):
+        client = self.connected_client(
+            [AssistantMessage(content=[TextBlock("a"), TextBlock("b")], model="m")]
+        )
+
+        assert await client.query("hi") == "ab"
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_result_is_retryable(self):
+        client = self.connected_client([_result(is_error=True, api_error_status=429)])
+
+        with pytest.raises(ClaudeQueryError) as exc_info:
+            await client.query("hi")
+
+        assert exc_info.value.retryable
+
+    @pytest.mark.asyncio
+    async def test_other_error_result_is_not_retryable(self):
+        client = self.connected_client(
+            [
+                AssistantMessage(content=[TextBlock("partial")], model="m"),
+                _result(is_error=True, api_error_status=400),
+            ]
+        )
+
+        with pytest.raises(ClaudeQueryError) as exc_info:
+            await client.query("hi")
+
+        assert not exc_info.value.retryable
+
+    @pytest.mark.asyncio
+    async def test_early_exit_drains_response(self):
+        client = _client_with_session(
+            {"first": ["a", "b", "c"], "second": ["fresh"]}
+        )
+
+        async with contextlib.aclosing(client.stream("first")) as chunks:
+            async for chunk in chunks:
+                assert chunk == "a"
+                break
+
+        assert client.client.pending == []
+        assert await client.query("second") == "fresh"
+
+    @pytest.mark.asyncio
+    async def test_requires_connection(self):
+        with pytest.raises(ValueError, match="not connected"):
+            await AnalyzerClaudeClient().query("hi")
+
+
+class TestAnalyzerClaudeClientPool:
+    @pytest.mark.asyncio
+    async def test_queries_use_separate_clients(self):
+        pool = AnalyzerClaudeClientPool(2)
+        in_use = set()
+        seen = set()
+
+        def make_query(client):
+            async def query(prompt):
+                assert client not in in_use
+                in_use.add(client)
+                seen.add(client)
+                await asyncio.sleep(0.01)
+                in_use.discard(client)
+                return prompt.upper()
+
+            return query
+
+        for client in pool.clients:
+            client._connect = AsyncMock()
+            client._disconnect = AsyncMock()
+            client.query = make_query(client)
+
+        async with pool:
+            results = await asyncio.gather(*(pool.query(p) for p in "abcd"))
+
+        assert results == ["A", "B", "C", "D"]
+        assert seen == set(pool.clients)
+        for client in pool.clients:
+            client._disconnect.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_stream_returns_client_to_pool(self):
+        pool = AnalyzerClaudeClientPool(1)
+        client = pool.clients[0]
+        client._connect = AsyncMock()
+        client._disconnect = AsyncMock()
+
+        async def stream(prompt):
+            yield prompt
+            yield "!"
+
+        client.stream = stream
+
+        async with pool:
+            first = [chunk async for chunk in pool.stream("a")]
+            second = [chunk async for chunk in pool.stream("b")]
+
+        assert first == ["a", "!"]
+        assert second == ["b", "!"]
+
+    @pytest.mark.asyncio
+    async def test_stream_early_exit_leaves_client_clean(self):
+        pool = AnalyzerClaudeClientPool(1)
+        session_client = _client_with_session(
+            {"first": ["a", "b", "c"], "second": ["fresh"]}
+        )
+        session_client._connect = AsyncMock()
+        session_client._disconnect = AsyncMock()
+        pool.clients = [session_client]
+
+        async with pool:
+            with pytest.raises(OSError):
+                async with contextlib.aclosing(pool.stream("first")) as chunks:
+                    async for chunk in chunks:
+                        raise OSError("sink write failed")
+
+            assert await pool.query("second") == "fresh"
+
+    def test_rejects_empty_pool(self):
+        with pytest.raises(ValueError, match="at least 1"):
+            AnalyzerClaudeClientPool(0)
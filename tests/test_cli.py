@@ -1,12 +1,17 @@
 """Tests for CLI commands."""
 
+import asyncio
 import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 from click.testing import CliRunner
 
+from agent_audit.analyzer.claude_client import ClaudeQueryError
 from agent_audit.cli import main
+from agent_audit.database import Database
+from agent_audit.models import Session
 
 
 @pytest.fixture
@@ -64,3 +69,195 @@ class TestCli:
         result = runner.invoke(main, ["analyze", "--help"])
         assert result.exit_code == 0
         assert "--synthesize" in result.output
+
+    def test_analyze_synthesize_reports_claude_errors(self, runner, temp_archive_dir):
+        """A Claude error result during synthesis is reported, not raised."""
+        Database(temp_archive_dir / "sessions.db").connect().close()
+        analysis_dir = temp_archive_dir / "analysis" / "run-1"
+        analysis_dir.mkdir(parents=True)
+        (analysis_dir / "alpha.md").write_text("# Alpha")
+
+        class FailingClient:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                pass
+
+            async def query(self, prompt):
+                raise ClaudeQueryError("Claude query failed (error_max_turns)")
+
+        with patch(
+            "agent_audit.analyzer.claude_client.AnalyzerClaudeClient", FailingClient
+        ):
+            result = runner.invoke(
+                main,
+                [
+                    "analyze",
+                    "--archive-dir",
+                    str(temp_archive_dir),
+                    "--synthesize",
+                    str(analysis_dir),
+                ],
+            )
+
+        assert result.exit_code == 0, result.output
+        assert "Error: Claude query failed (error_max_turns)" in result.output
+        assert "Synthesis complete." in result.output
+
+
+class TestCliSessionAnalysis:
+    """Tests for the per-project analyze path."""
+
+    @staticmethod
+    def make_archive(archive_dir):
+        with Database(archive_dir / "sessions.db") as db:
+            for i, project in enumerate(["alpha", "beta"]):
+                db.insert_session(
+                    Session(
+                        id=f"s{i}",
+                        project=project,
+                        started_at=f"2026-01-0{i + 1}T10:00:00Z",
+                    )
+                )
+
+    @staticmethod
+    def fake_pool(query, pools):
+        class FakePool:
+            def __init__(self, size, options=None):
+                self.size = size
+                self.options = options
+                pools.append(self)
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                pass
+
+            async def stream(self, prompt):
+                # Yield the answer in two chunks, the second after a pause
+                answer = await query(prompt)
+                half = len(answer) // 2
+                yield answer[:half]
+                await asyncio.sleep(0)
+                yield answer[half:]
+
+        return FakePool
+
+    def test_writes_each_analysis_as_it_finishes(self, runner, temp_archive_dir):
+        """Finished projects are saved even when a later one fails."""
+        self.make_archive(temp_archive_dir)
+        written_before_beta = []
+
+        async def query(prompt):
+            if "/beta" in prompt:
+                await asyncio.sleep(0.05)
+                written_before_beta.extend(
+                    temp_archive_dir.glob("analysis/run-*/alpha.md")
+                )
+                raise ValueError("beta failed")
+            return "# Alpha analysis"
+
+        pools = []
+        with patch(
+            "agent_audit.analyzer.claude_client.AnalyzerClaudeClientPool",
+            self.fake_pool(query, pools),
+        ):
+            result = runner.invoke(
+                main,
+                [
+                    "analyze",
+                    "--archive-dir",
+                    str(temp_archive_dir),
+                    "--concurrency",
+                    "3",
+                ],
+            )
+
+        assert result.exit_code == 0, result.output
+        assert [pool.size for pool in pools] == [2]
+        assert "Analyzing 2 projects (2 at a time)" in result.output
+        assert "beta: Error: beta failed" in result.output
+        assert len(written_before_beta) == 1
+        assert written_before_beta[0].read_text() == "# Alpha analysis"
+        assert not list(temp_archive_dir.glob("analysis/run-*/beta.md"))
+        assert result.output.index("Written:") < result.output.index("beta: Error")
+
+    def test_streams_analysis_into_file(self, runner, temp_archive_dir):
+        """Output reaches disk chunk by chunk, before the answer completes."""
+        self.make_archive(temp_archive_dir)
+        seen_on_disk = []
+
+        class StreamingPool:
+            def __init__(self, size, options=None):
+                pass
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                pass
+
+            async def stream(self, prompt):
+                project = "alpha" if "/alpha" in prompt else "beta"
+                path = next(temp_archive_dir.glob("analysis/run-*")) / f"{project}.md"
+                yield f"# {project}\n"
+                seen_on_disk.append(path.read_text())
+                yield "done\n"
+
+        with patch(
+            "agent_audit.analyzer.claude_client.AnalyzerClaudeClientPool",
+            StreamingPool,
+        ):
+            result = runner.invoke(
+                main, ["analyze", "--archive-dir", str(temp_archive_dir)]
+            )
+
+        assert result.exit_code == 0, result.output
+        assert sorted(seen_on_disk) == ["# alpha\n", "# beta\n"]
+        run_dir = next(temp_archive_dir.glob("analysis/run-*"))
+        assert (run_dir / "alpha.md").read_text() == "# alpha\ndone\n"
+
+    def test_concurrency_limits_pool_size(self, runner, temp_archive_dir):
+        """--concurrency caps the number of Claude sessions."""
+        self.make_archive(temp_archive_dir)
+        in_flight = 0
+        max_in_flight = 0
+
+        async def query(prompt):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return "# Analysis"
+
+        pools = []
+        with patch(
+            "agent_audit.analyzer.claude_client.AnalyzerClaudeClientPool",
+            self.fake_pool(query, pools),
+        ):
+            result = runner.invoke(
+                main,
+                [
+                    "analyze",
+                    "--archive-dir",
+                    str(temp_archive_dir),
+                    "--concurrency",
+                    "1",
+                ],
+            )
+
+        assert result.exit_code == 0, result.output
+        assert [pool.size for pool in pools] == [1]
+        assert max_in_flight == 1
+        assert len(list(temp_archive_dir.glob("analysis/run-*/*.md"))) == 2
+        assert "Analysis complete." in result.output
+
+    def test_rejects_zero_concurrency(self, runner, temp_archive_dir):
+        result = runner.invoke(
+            main,
+            ["analyze", "--archive-dir", str(temp_archive_dir), "--concurrency", "0"],
+        )
+        assert result.exit_code != 0
@@ -11,15 +11,11 @@ from agent_audit.models import Commit, Message, Session, ToolCall, ToolResult
 
 @pytest.fixture
 def db():
-    """Create a temporary database for testing."""
-    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
-        db_path = Path(f.name)
-
-    database = Database(db_path)
+    """Create an in-memory database for testing."""
+    database = Database(Path(":memory:"))
     database.connect()
     yield database
     database.close()
-    db_path.unlink()
 
 
 @pytest.fixture
@@ -336,6 +332,15 @@ class TestDatabase:
 
         db_path.unlink()
 
+    def test_in_memory_database(self, sample_session, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+
+        with Database(Path(":memory:")) as db:
+            db.insert_session(sample_session)
+            assert db.session_exists("test-session-123")
+
+        assert list(tmp_path.iterdir()) == []
+
     def test_stores_parent_session_id(self, db):
         """Test that parent_session_id is stored correctly for agent sessions."""
         parent_session = Session(
@@ -553,6 +558,58 @@ class TestDatabase:
         assert metrics["total_output_tokens"] == 0
         assert metrics["tool_call_count"] == 0
 
+    def test_get_project_metrics_batch(self, db):
+        """Test getting metrics for several projects in one call."""
+        db.insert_session(
+            Session(
+                id="s1",
+                project="p1",
+                started_at="2026-01-01T10:00:00Z",
+                total_input_tokens=100,
+                total_output_tokens=200,
+                messages=[
+                    Message(
+                        id="m1",
+                        session_id="s1",
+                        type="user",
+                        timestamp="2026-01-01T10:00:00Z",
+                        content="Hi",
+                    ),
+                ],
+                tool_calls=[
+                    ToolCall(
+                        id="tc1",
+                        message_id="m1",
+                        session_id="s1",
+                        tool_name="Read",
+                        input_json="{}",
+                        timestamp="2026-01-01T10:00:01Z",
+                    ),
+                ],
+            )
+        )
+        db.insert_session(
+            Session(
+                id="s2",
+                project="p2",
+                started_at="2026-01-02T10:00:00Z",
+                total_input_tokens=50,
+                total_output_tokens=75,
+            )
+        )
+
+        metrics = db.get_project_metrics_batch(["p1", "p2", "missing"])
+
+        assert list(metrics) == ["p1", "p2", "missing"]
+        assert metrics["p1"] == db.get_project_metrics("p1")
+        assert metrics["p1"]["turn_count"] == 1
+        assert metrics["p1"]["tool_call_count"] == 1
+        assert metrics["p2"]["session_count"] == 1
+        assert metrics["p2"]["total_output_tokens"] == 75
+        assert metrics["p2"]["tool_call_count"] == 0
+        assert metrics["missing"]["session_count"] == 0
+        assert db.get_project_metrics_batch([]) == {}
+
     def test_get_global_percentiles(self, db):
         """Test getting global percentile statistics across all projects."""
         # Create sessions with varying message counts and tokens
@@ -352,6 +352,28 @@ class TestAnalyzeToolPatterns:
         assert ("Bash", "Read", "Edit") in trigrams
         assert trigrams[("Bash", "Read", "Edit")] == 2
 
+    def test_trigrams_need_three_calls(self):
+        tool_calls = [
+            _make_tool_call("Bash", tc_id="1"),
+            _make_tool_call("Read", tc_id="2"),
+        ]
+        result = _analyze_tool_patterns(tool_calls)
+        assert result["top_trigrams"] == []
+
+    def test_trigram_ties_keep_first_seen_order(self):
+        names = ["Read", "Edit", "Bash", "Grep", "Write", "Glob", "Task"]
+        tool_calls = [
+            _make_tool_call(name, tc_id=str(i)) for i, name in enumerate(names)
+        ]
+        result = _analyze_tool_patterns(tool_calls)
+        assert result["top_trigrams"] == [
+            (("Read", "Edit", "Bash"), 1),
+            (("Edit", "Bash", "Grep"), 1),
+            (("Bash", "Grep", "Write"), 1),
+            (("Grep", "Write", "Glob"), 1),
+            (("Write", "Glob", "Task"), 1),
+        ]
+
 
 class TestAnalyzeThinkingBlocks:
     """Tests for _analyze_thinking_blocks."""
@@ -1704,3 +1726,47 @@ class TestGetSessionByIdPrefix:
 
             with pytest.raises(ValueError, match="Ambiguous"):
                 db.get_session_by_id_prefix("abc123")
+
+
+class TestReconstructSessionFromDb:
+    """Tests for _reconstruct_session_from_db."""
+
+    def test_attaches_tool_calls_to_their_messages(self, temp_archive_dir):
+        from agent_audit.database import Database
+        from agent_audit.debrief import _reconstruct_session_from_db
+        from agent_audit.models import Message, Session, ToolCall
+
+        db = Database(temp_archive_dir / "sessions.db")
+        with db:
+            db.insert_session(Session(
+                id="s1",
+                project="test",
+                started_at="2026-02-10T10:00:00Z",
+                messages=[
+                    Message(
+                        id=f"m{i}",
+                        session_id="s1",
+                        type="assistant",
+                        timestamp=f"2026-02-10T10:00:0{i}Z",
+                        content="",
+                    )
+                    for i in range(3)
+                ],
+                tool_calls=[
+                    ToolCall(
+                        id=f"tc{i}",
+                        message_id=message_id,
+                        session_id="s1",
+                        tool_name="Read",
+                        input_json="{}",
+                        timestamp=f"2026-02-10T10:00:0{i}Z",
+                    )
+                    for i, message_id in enumerate(["m2", "m0", "m2"])
+                ],
+            ))
+
+            session = _reconstruct_session_from_db(db, db.get_all_sessions()[0])
+
+        by_id = {m.id: [tc.id for tc in m.tool_calls] for m in session.messages}
+        assert by_id == {"m0": ["tc1"], "m1": [], "m2": ["tc0", "tc2"]}
+        assert [tc.id for tc in session.tool_calls] == ["tc0", "tc1", "tc2"]
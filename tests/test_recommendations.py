@@ -243,6 +243,75 @@ description = "Test"
 
         assert recommendations[0].category == RecommendationCategory.WORKFLOW
 
+    def test_parse_blocks_with_embedded_fences(self, tmp_path):
+        """Fences inside triple-quoted strings don't end the TOML block."""
+        synthesis_content = '''# Synthesis
+
+```toml
+[[recommendations]]
+category = "hook"
+title = "First"
+content = """
+```json
+{"a": 1}
+```
+"""
+```
+
+Between blocks.
+
+```toml
+[[recommendations]]
+title = "Second"
+```
+'''
+        synthesis_path = tmp_path / "global-synthesis.md"
+        synthesis_path.write_text(synthesis_content)
+
+        recommendations = parse_recommendations_from_synthesis(synthesis_path)
+
+        assert [r.title for r in recommendations] == ["First", "Second"]
+        assert '{"a": 1}' in recommendations[0].content
+
+    def test_parse_reparses_modified_file(self, tmp_path):
+        """Cached results are reused until the file changes."""
+        synthesis_path = tmp_path / "global-synthesis.md"
+        synthesis_path.write_text(
+            '```toml\n[[recommendations]]\ntitle = "First"\n```\n'
+        )
+
+        first = parse_recommendations_from_synthesis(synthesis_path)
+        again = parse_recommendations_from_synthesis(synthesis_path)
+        assert first is not again
+        assert [r.title for r in again] == ["First"]
+
+        synthesis_path.write_text(
+            '```toml\n[[recommendations]]\ntitle = "Second title"\n```\n'
+        )
+
+        updated = parse_recommendations_from_synthesis(synthesis_path)
+        assert [r.title for r in updated] == ["Second title"]
+
+    def test_parse_returns_independent_objects(self, tmp_path):
+        """Mutating a parsed result does not leak into later parses."""
+        synthesis_path = tmp_path / "global-synthesis.md"
+        synthesis_path.write_text(
+            "```toml\n[[recommendations]]\n"
+            'title = "First"\nevidence = ["a"]\n'
+            "[recommendations.metadata]\nkey = 1\n```\n"
+        )
+
+        first = parse_recommendations_from_synthesis(synthesis_path)
+        first[0].title = "Changed"
+        first[0].evidence.append("b")
+        first[0].metadata["key"] = 2
+
+        again = parse_recommendations_from_synthesis(synthesis_path)
+        assert again[0] is not first[0]
+        assert again[0].title == "First"
+        assert again[0].evidence == ["a"]
+        assert again[0].metadata == {"key": 1}
+
 
 class TestRecommendationGenerator:
     """Tests for RecommendationGenerator class."""
@@ -446,3 +515,21 @@ class TestRecommendationGenerator:
         assert "mcp-mcp.md" in filenames
         assert "workflow-workflow.md" in filenames
         assert "prompt-prompt.md" in filenames
+
+    def test_generate_all_shared_filename_last_wins(self, tmp_path):
+        """Recommendations sharing an output file are written in order."""
+        generator = RecommendationGenerator(tmp_path)
+        recommendations = [
+            Recommendation(
+                category=RecommendationCategory.CLAUDE_MD,
+                title=f"Addition {i}",
+                description="Description",
+            )
+            for i in range(5)
+        ]
+
+        paths = generator.generate_all(recommendations)
+
+        assert len(paths) == 5
+        assert {p.name for p in paths} == {"claude-md-additions.md"}
+        assert "Addition 4" in paths[0].read_text()
@@ -1,5 +1,7 @@
 """Tests for session analyzer module."""
 
+import asyncio
+import io
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock
 
@@ -7,6 +9,7 @@ import pytest
 
 from agent_audit.analyzer.session_analyzer import (
     SessionAnalyzer,
+    build_session_analysis_instructions,
     build_session_analysis_prompt,
     load_session_analysis_template,
     build_global_synthesis_prompt,
@@ -23,6 +26,13 @@ class TestLoadSessionAnalysisTemplate:
         assert isinstance(template, str)
         assert len(template) > 100
 
+    def test_template_read_once(self):
+        """Repeated loads return the cached template."""
+        load_session_analysis_template.cache_clear()
+        first = load_session_analysis_template()
+        assert load_session_analysis_template() is first
+        assert load_session_analysis_template.cache_info().hits == 1
+
     def test_template_has_placeholders(self):
         """Template contains required placeholders."""
         template = load_session_analysis_template()
@@ -106,6 +116,37 @@ class TestBuildSessionAnalysisPrompt:
         assert "300" in prompt  # project_max_msgs
         assert "30,000" in prompt  # project_avg_tokens formatted
 
+    def test_instructions_split_from_project_context(self):
+        """Context-only prompt plus instructions covers the full prompt."""
+        kwargs = dict(
+            project="test-project",
+            session_count=10,
+            turn_count=50,
+            input_tokens=1000,
+            output_tokens=2000,
+            tool_call_count=100,
+            toml_dir="/path/to/toml",
+            global_p50_msgs=126,
+            global_p75_msgs=251,
+            global_p90_msgs=346,
+            global_p50_tokens=25000,
+            project_avg_msgs=150,
+            project_min_msgs=10,
+            project_max_msgs=300,
+            project_avg_tokens=30000,
+        )
+        full = build_session_analysis_prompt(**kwargs)
+        context = build_session_analysis_prompt(**kwargs, include_instructions=False)
+        instructions = build_session_analysis_instructions(global_p75_msgs=251)
+
+        assert "test-project" in context
+        assert "/path/to/toml" in context
+        assert "system prompt" in context
+        assert "Verification Protocol" not in context
+        assert "test-project" not in instructions
+        assert "P75 of 251" in instructions
+        assert full.endswith(instructions)
+
 
 class TestSessionAnalyzer:
     """Tests for SessionAnalyzer class."""
@@ -210,6 +251,349 @@ class TestSessionAnalyzer:
         # Should still call Claude even with empty project
         mock_client.query.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_analyze_projects_bounded_concurrency(self, mock_client, mock_db):
+        """Projects run concurrently up to the limit; failures are returned."""
+        in_flight = 0
+        max_in_flight = 0
+
+        async def query(prompt):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if "/fake/toml/broken" in prompt:
+                raise RuntimeError("query failed")
+            return "analysis"
+
+        mock_client.query = AsyncMock(side_effect=query)
+        analyzer = SessionAnalyzer(
+            client=mock_client,
+            db=mock_db,
+            toml_dir=Path("/fake/toml"),
+        )
+
+        projects = ["a", "b", "broken", "c", "d"]
+        metrics = mock_db.get_project_metrics.return_value
+        mock_db.get_project_metrics_batch = MagicMock(
+            return_value={project: metrics for project in projects}
+        )
+        results = await analyzer.analyze_projects(projects, concurrency=2)
+
+        mock_db.get_project_metrics_batch.assert_called_once_with(projects)
+        mock_db.get_project_metrics.assert_not_called()
+        mock_db.get_global_percentiles.assert_called_once()
+        assert list(results) == projects
+        assert max_in_flight == 2
+        assert results["a"] == "analysis"
+        assert isinstance(results["broken"], RuntimeError)
+
+    @pytest.mark.asyncio
+    async def test_analyze_projects_reports_each_result_when_done(
+        self, mock_client, mock_db
+    ):
+        """on_result fires per project in completion order, errors included."""
+        delays = {"slow": 0.03, "fast": 0.0, "broken": 0.01}
+
+        async def query(prompt):
+            project = next(p for p in delays if f"/fake/toml/{p}" in prompt)
+            await asyncio.sleep(delays[project])
+            if project == "broken":
+                raise ValueError("bad prompt")
+            return f"analysis of {project}"
+
+        mock_client.query = AsyncMock(side_effect=query)
+        analyzer = SessionAnalyzer(
+            client=mock_client,
+            db=mock_db,
+            toml_dir=Path("/fake/toml"),
+        )
+        reported = []
+
+        results = await analyzer.analyze_projects(
+            list(delays),
+            metrics_by_project={
+                p: mock_db.get_project_metrics.return_value for p in delays
+            },
+            on_result=lambda project, result: reported.append((project, result)),
+        )
+
+        assert [project for project, _ in reported] == ["fast", "broken", "slow"]
+        assert reported[0][1] == "analysis of fast"
+        assert isinstance(reported[1][1], ValueError)
+        assert list(results) == ["slow", "fast", "broken"]
+
+    @pytest.mark.asyncio
+    async def test_analyze_projects_uses_prefetched_inputs(self, mock_client, mock_db):
+        """Metrics and percentiles passed in are not fetched again."""
+        analyzer = SessionAnalyzer(
+            client=mock_client,
+            db=mock_db,
+            toml_dir=Path("/fake/toml"),
+        )
+        metrics = mock_db.get_project_metrics.return_value
+        percentiles = mock_db.get_global_percentiles.return_value
+
+        results = await analyzer.analyze_projects(
+            ["a", "b"],
+            metrics_by_project={"a": metrics, "b": metrics},
+            global_percentiles=percentiles,
+        )
+
+        assert set(results) == {"a", "b"}
+        mock_db.get_project_metrics_batch.assert_not_called()
+        mock_db.get_project_metrics.assert_not_called()
+        mock_db.get_global_percentiles.assert_not_called()
+        assert mock_client.query.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_analyze_projects_retries_retryable_errors(
+        self, mock_client, mock_db, monkeypatch
+    ):
+        """Rate-limited projects back off and retry; other errors do not."""
+
+        class RateLimited(RuntimeError):
+            retryable = True
+
+        attempts = {"flaky": 0, "broken": 0}
+
+        async def query(prompt):
+            for project in attempts:
+                if f"/fake/toml/{project}" in prompt:
+                    attempts[project] += 1
+                    if project == "flaky" and attempts[project] < 3:
+                        raise RateLimited("429")
+                    if project == "broken":
+                        raise ValueError("bad prompt")
+            return "analysis"
+
+        delays = []
+
+        async def fake_sleep(delay):
+            delays.append(delay)
+
+        monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+        mock_client.query = AsyncMock(side_effect=query)
+        mock_db.get_project_metrics_batch = MagicMock(
+            return_value={
+                p: mock_db.get_project_metrics.return_value
+                for p in ["flaky", "broken"]
+            }
+        )
+        analyzer = SessionAnalyzer(
+            client=mock_client,
+            db=mock_db,
+            toml_dir=Path("/fake/toml"),
+        )
+
+        results = await analyzer.analyze_projects(
+            ["flaky", "broken"], retry_base_delay=1.0
+        )
+
+        assert results["flaky"] == "analysis"
+        assert isinstance(results["broken"], ValueError)
+        assert attempts == {"flaky": 3, "broken": 1}
+        assert len(delays) == 2
+        assert 1.0 <= delays[0] < 2.0
+        assert 2.0 <= delays[1] < 3.0
+
+    @pytest.mark.asyncio
+    async def test_analyze_projects_gives_up_after_max_retries(
+        self, mock_client, mock_db, monkeypatch
+    ):
+        """The last retryable error is returned once retries run out."""
+
+        class RateLimited(RuntimeError):
+            retryable = True
+
+        monkeypatch.setattr(asyncio, "sleep", AsyncMock())
+        mock_client.query = AsyncMock(side_effect=RateLimited("429"))
+        mock_db.get_project_metrics_batch = MagicMock(
+            return_value={"a": mock_db.get_project_metrics.return_value}
+        )
+        analyzer = SessionAnalyzer(
+            client=mock_client,
+            db=mock_db,
+            toml_dir=Path("/fake/toml"),
+        )
+
+        results = await analyzer.analyze_projects(["a"], max_retries=2)
+
+        assert isinstance(results["a"], RateLimited)
+        assert mock_client.query.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_analyze_project_caches_unchanged_inputs(
+        self, mock_client, mock_db
+    ):
+        """Re-analyzing with the same metrics reuses the earlier answer."""
+        analyzer = SessionAnalyzer(
+            client=mock_client,
+            db=mock_db,
+            toml_dir=Path("/fake/toml"),
+        )
+
+        first = await analyzer.analyze_project("my-project")
+        second = await analyzer.analyze_project("my-project")
+        assert first == second
+        mock_client.query.assert_called_once()
+
+        mock_db.get_project_metrics.return_value = {
+            **mock_db.get_project_metrics.return_value,
+            "session_count": 6,
+        }
+        await analyzer.analyze_project("my-project")
+        assert mock_client.query.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_analyze_project_coalesces_concurrent_duplicates(
+        self, mock_client, mock_db
+    ):
+        """Concurrent identical requests share one query; errors are retried."""
+
+        async def query(prompt):
+            await asyncio.sleep(0.01)
+            return "analysis"
+
+        mock_client.query = AsyncMock(side_effect=RuntimeError("boom"))
+        analyzer = SessionAnalyzer(
+            client=mock_client,
+            db=mock_db,
+            toml_dir=Path("/fake/toml"),
+        )
+
+        with pytest.raises(RuntimeError):
+            await analyzer.analyze_project("my-project")
+
+        mock_client.query = AsyncMock(side_effect=query)
+        results = await asyncio.gather(
+            *(analyzer.analyze_project("my-project") for _ in range(3))
+        )
+
+        assert results == ["analysis"] * 3
+        mock_client.query.assert_called_once()
+        assert analyzer._analysis_locks == {}
+        assert analyzer._analysis_lock_users == {}
+
+    @pytest.mark.asyncio
+    async def test_analyze_project_cache_evicts_least_recently_used(
+        self, mock_client, mock_db
+    ):
+        """The cache keeps at most cache_size analyses."""
+        mock_client.query = AsyncMock(side_effect=lambda prompt: prompt[-20:])
+        analyzer = SessionAnalyzer(
+            client=mock_client,
+            db=mock_db,
+            toml_dir=Path("/fake/toml"),
+            cache_size=2,
+        )
+
+        await analyzer.analyze_project("a")
+        await analyzer.analyze_project("b")
+        await analyzer.analyze_project("a")  # hit; "b" is now least recent
+        await analyzer.analyze_project("c")  # evicts "b"
+        assert mock_client.query.call_count == 3
+        assert [key[0] for key in analyzer._analysis_cache] == ["a", "c"]
+
+        await analyzer.analyze_project("a")
+        assert mock_client.query.call_count == 3
+        await analyzer.analyze_project("b")
+        assert mock_client.query.call_count == 4
+
+    @pytest.mark.asyncio
+    async def test_analyze_project_stream(self, mock_client, mock_db):
+        """Streamed chunks are written to the sink as they arrive."""
+        sink = io.StringIO()
+        written = []
+
+        async def stream(prompt):
+            assert "my-project" in prompt
+            for chunk in ["# Analysis", "\n\n", "Streamed"]:
+                yield chunk
+                written.append(sink.getvalue())
+
+        mock_client.stream = stream
+        analyzer = SessionAnalyzer(
+            client=mock_client,
+            db=mock_db,
+            toml_dir=Path("/fake/toml"),
+        )
+
+        result = await analyzer.analyze_project_stream("my-project", sink)
+
+        assert result == sink.getvalue() == "# Analysis\n\nStreamed"
+        assert written[0] == "# Analysis"
+        mock_client.query.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_analyze_project_stream_shares_cache(self, mock_client, mock_db):
+        """A cached analysis is replayed into the sink without a query."""
+        calls = []
+
+        async def stream(prompt):
+            calls.append(prompt)
+            yield "# Cached"
+
+        mock_client.stream = stream
+        analyzer = SessionAnalyzer(
+            client=mock_client,
+            db=mock_db,
+            toml_dir=Path("/fake/toml"),
+        )
+
+        await analyzer.analyze_project_stream("my-project", io.StringIO())
+        sink = io.StringIO()
+        result = await analyzer.analyze_project_stream("my-project", sink)
+
+        assert result == sink.getvalue() == "# Cached"
+        assert await analyzer.analyze_project("my-project") == "# Cached"
+        assert len(calls) == 1
+        mock_client.query.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_analyze_projects_streams_to_output_dir(
+        self, mock_client, mock_db, monkeypatch, tmp_path
+    ):
+        """Retries start the file over; failed projects leave no file."""
+
+        class RateLimited(RuntimeError):
+            retryable = True
+
+        attempts = {"flaky": 0, "broken": 0}
+
+        async def stream(prompt):
+            project = next(p for p in attempts if f"/fake/toml/{p}" in prompt)
+            attempts[project] += 1
+            yield f"partial {project} attempt {attempts[project]}\n"
+            if project == "broken":
+                raise ValueError("bad prompt")
+            if attempts[project] == 1:
+                raise RateLimited("429")
+            yield "done\n"
+
+        monkeypatch.setattr(asyncio, "sleep", AsyncMock())
+        mock_client.stream = stream
+        analyzer = SessionAnalyzer(
+            client=mock_client,
+            db=mock_db,
+            toml_dir=Path("/fake/toml"),
+        )
+
+        results = await analyzer.analyze_projects(
+            list(attempts),
+            metrics_by_project={
+                p: mock_db.get_project_metrics.return_value for p in attempts
+            },
+            output_dir=tmp_path,
+        )
+
+        assert results["flaky"] == "partial flaky attempt 2\ndone\n"
+        assert (tmp_path / "flaky.md").read_text() == results["flaky"]
+        assert isinstance(results["broken"], ValueError)
+        assert not (tmp_path / "broken.md").exists()
+        mock_client.query.assert_not_called()
+
 
 class TestLoadGlobalSynthesisTemplate:
     """Tests for loading the global synthesis prompt template."""